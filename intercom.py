@@ -1,11 +1,15 @@
 import argparse
+import asyncio
+import os
 import socket
-import struct
 import subprocess
 import time
-import threading
 import sys
-import collections
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
 
 # Fixed configuration
 CHUNK_SIZE = 320
@@ -13,170 +17,478 @@ FRAME_LEN = 332
 MAX_BUFFER_AHEAD_MS = 2000
 SPEED_MULTIPLIER = 1.0
 
-# Queue limit for unconnected clients (approx 50 mins of audio)
-MAX_QUEUE_SIZE_UNCONNECTED = 50000 
+# Shared queue capacity in chunks (about 16.7 min of audio at 8 kHz, 8.3 min at 16 kHz, 3 min at 44.1 kHz)
+MAX_QUEUE_SIZE = 50000
+
+# Max frames coalesced into a single write (one syscall per batch)
+MAX_BATCH_FRAMES = 32
+
+# Constant per-frame prefix: $ + Channel(2) + Length(Little Endian) + padding
+FRAME_HEADER = bytes((0x24, 0x02, FRAME_LEN & 0xFF, (FRAME_LEN >> 8) & 0xFF)) + bytes(12)
+FRAME_SIZE = len(FRAME_HEADER) + CHUNK_SIZE # Bytes on the wire per frame
+
+# RTSP backchannel commands, only the camera IP varies
+OPEN_CMD = (
+    "USER_CMD_SET rtsp://%s/onvif0 RTSP/1.0\r\n"
+    "CSeq: 8\r\n"
+    "Content-length: strlen(Content-type)\r\n"
+    "Content-type: AudioCtlCmd:OPEN\r\n\r\n"
+)
+CLOSE_CMD = (
+    "USER_CMD_SET rtsp://%s/onvif1 RTSP/1.0\r\n"
+    "CSeq: 10\r\n"
+    "Content-length: strlen(Content-type)\r\n"
+    "Content-type: AudioCtlCmd:CLOSE\r\n\r\n"
+)
+
+# Throttle wakeups snap to this shared grid so one event loop pass serves every due camera
+SEND_TICK_NS = 20_000_000
+
+# os.writev() is not available on Windows, frames always go through the transport there
+HAS_WRITEV = hasattr(os, 'writev')
+
+# Kernel send buffer per camera socket
+SOCKET_SNDBUF = 1 << 20
+
+# Requested FFmpeg stdout pipe size (Linux only, capped by /proc/sys/fs/pipe-max-size)
+FFMPEG_PIPE_SIZE = 1 << 20
+
+# Timeout for connecting and for the camera to accept the OPEN command
+CONNECT_TIMEOUT = 10.0
+
+# A camera whose socket has not drained for this long stops holding back the shared queue
+STALL_TIMEOUT = 2.0
+
+class SharedRing:
+    """Fixed-size ring of audio chunks shared by every client.
+
+    Chunks live in one preallocated slab, so a full queue is a single buffer
+    rather than tens of thousands of small bytes objects. Every slot is a
+    complete frame with FRAME_HEADER stamped in once at allocation, so clients
+    send straight from the slab without interleaving headers. The producer
+    publishes each chunk once and every client reads behind its own cursor.
+    The producer never overwrites a chunk a camera that keeps up has not sent
+    yet: publish() only takes what fits and the producer waits for room.
+    Clients that are not connected or have been stalled on TCP backpressure
+    for STALL_TIMEOUT do not count, so a slow camera never holds back the
+    others; it falls behind and has its cursor clamped forward to the oldest
+    chunk still in the ring.
+    """
+
+    def __init__(self, capacity):
+        self.cap = capacity
+        self.slab = bytearray(FRAME_HEADER + bytes(CHUNK_SIZE)) * capacity
+        self.view = memoryview(self.slab)
+        self.tail = 0
+        self.readers = [] # Clients reading from the ring
+        self.on_space = None # Producer callback, set while it waits for room
+        self._waiters = {} # Event -> tail it is waiting for
+
+    def free(self):
+        # Slots the producer may fill without overwriting unsent chunks of a camera that keeps up
+        cursors = [reader.cursor for reader in self.readers if reader.is_connected and not reader.stalled]
+        if not cursors:
+            return self.cap
+        return self.cap - (self.tail - min(cursors))
+
+    def reader_moved(self):
+        # Called after a client reads, stalls or disconnects; resume the producer once
+        # a useful amount of room is free rather than after every frame
+        if self.on_space and self.free() >= self.cap // 8:
+            callback, self.on_space = self.on_space, None
+            callback()
+
+    def publish(self, data):
+        # data holds whole chunks; each is copied into the payload part of its slot.
+        # Returns how many chunks fitted, the caller keeps the rest
+        count = min(len(data) // CHUNK_SIZE, self.free())
+
+        # One copy per chunk, so headers are stamped once and every camera sends contiguous spans
+        view = self.view
+        header_len = len(FRAME_HEADER)
+        first = self.tail % self.cap
+        src = 0
+        remaining = count
+        while remaining:
+            # Slots up to the end of the slab are consecutive, then it wraps to slot 0
+            run = min(remaining, self.cap - first)
+            dst = range(first * FRAME_SIZE + header_len, (first + run) * FRAME_SIZE, FRAME_SIZE)
+            for pos, offset in zip(dst, range(src, src + run * CHUNK_SIZE, CHUNK_SIZE)):
+                view[pos:pos + CHUNK_SIZE] = data[offset:offset + CHUNK_SIZE]
+            src += run * CHUNK_SIZE
+            remaining -= run
+            first = 0
+
+        self.tail += count
+        if self._waiters:
+            self._notify()
+        return count
+
+    def _notify(self):
+        for event, target in list(self._waiters.items()):
+            if self.tail >= target:
+                del self._waiters[event]
+                event.set()
+
+    async def wait_until(self, target, event):
+        self._waiters[event] = target
+        try:
+            if self.tail < target:
+                await event.wait()
+        finally:
+            self._waiters.pop(event, None)
+
+    def available(self, cursor):
+        return min(self.tail - cursor, self.cap)
+
+    def read(self, cursor, n):
+        # Consecutive frames are contiguous in the slab: at most two spans (wrap-around)
+        start = max(cursor, self.tail - self.cap)
+        end = min(self.tail, start + n)
+        first = start % self.cap
+        last = first + (end - start)
+        if last <= self.cap:
+            spans = [self.view[first * FRAME_SIZE:last * FRAME_SIZE]]
+        else:
+            spans = [self.view[first * FRAME_SIZE:], self.view[:(last - self.cap) * FRAME_SIZE]]
+        return spans, start, end
+
+class CameraProtocol(asyncio.Protocol):
+    """Socket callbacks for one camera, run directly by the event loop's selector."""
+
+    def __init__(self, client):
+        self.client = client
+        self.can_write = asyncio.Event()
+        self.can_write.set()
+
+    def data_received(self, data):
+        self.client._on_data(data)
+
+    def connection_lost(self, exc):
+        self.can_write.set()
+        self.client._on_connection_lost(exc)
+
+    def pause_writing(self):
+        self.can_write.clear()
+
+    def resume_writing(self):
+        self.can_write.set()
 
 class CameraClient:
-    def __init__(self, ip, port, sample_rate, debug=False):
+    def __init__(self, ip, port, sample_rate, ring, debug=False):
         self.ip = ip
         self.port = port
         self.sample_rate = sample_rate
         self.debug = debug
-        self.sock = None
-        self.audio_queue = collections.deque()
-        self.start_time = 0
-        self.total_bytes_sent = 0
+        self.transport = None
+        self.protocol = None
+        self._fd = None # Raw socket fd for vectored writes, None when not connected
+        self.ring = ring
+        self.ring.readers.append(self)
+        self.cursor = 0 # Next ring position this client will send
+        self.start_time_ns = 0 # Monotonic clock, set after the initial burst
+        self.chunks_sent = 0
         self.is_connected = False
+        self.stalled = False # Not draining for STALL_TIMEOUT, the ring no longer waits for us
         self.running = True
-        
-        # Thread for processing queue
-        self.thread = threading.Thread(target=self._process_queue_loop, daemon=True)
-        self.thread.start()
-        
-        # Connect immediately
-        self.connect()
-
-    def log_debug(self, msg):
-        if self.debug:
-            print(f"[DEBUG][{self.ip}] {msg}")
 
-    def connect(self):
+        # Wakes the send loop on connect or when the ring has enough data
+        self._wake = asyncio.Event()
+        self._handshake_timer = None
+
+        # RTSP commands only depend on the IP, so encode them once
+        self._open_cmd_bytes = (OPEN_CMD % self.ip).encode()
+        self._close_cmd_bytes = (CLOSE_CMD % self.ip).encode()
+
+        # Connect immediately, then process the queue on the same event loop
+        self.task = asyncio.ensure_future(self._run())
+
+    def log_debug(self, fmt, *args):
+        # Formatting is deferred so disabled debug logs cost only this check
+        if not self.debug:
+            return
+        print(f"[DEBUG][{self.ip}] {fmt % args if args else fmt}")
+
+    async def _run(self):
+        await self.connect()
+        if self.running:
+            await self._process_queue_loop()
+
+    async def connect(self):
         print(f"[{self.ip}] Connecting...")
-        self.log_debug(f"Connecting to {self.ip}:{self.port}...")
+        self.log_debug("Connecting to %s:%d...", self.ip, self.port)
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(10.0) # 10s timeout for initial connection
-            self.sock.connect((self.ip, self.port))
-            
-            # Send OPEN command
-            open_cmd = (
-                f"USER_CMD_SET rtsp://{self.ip}/onvif0 RTSP/1.0\r\n"
-                "CSeq: 8\r\n"
-                "Content-length: strlen(Content-type)\r\n"
-                "Content-type: AudioCtlCmd:OPEN\r\n\r\n"
-            )
-            self.sock.sendall(open_cmd.encode())
+            loop = asyncio.get_running_loop()
+            self.transport, self.protocol = await asyncio.wait_for(
+                loop.create_connection(lambda: CameraProtocol(self), self.ip, self.port), CONNECT_TIMEOUT)
+
+            # Small frames must leave immediately, not wait for Nagle/delayed ACK
+            sock = self.transport.get_extra_info('socket')
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SNDBUF)
+            self._fd = sock.fileno()
+
+            # Send OPEN command, the camera must accept within the connect timeout
+            self.transport.write(self._open_cmd_bytes)
+            self._handshake_timer = loop.call_later(CONNECT_TIMEOUT, self._on_handshake_timeout)
             self.log_debug("Sent OPEN command")
-            
-            # Start listener thread
-            listener = threading.Thread(target=self._listen, daemon=True)
-            listener.start()
-            
-        except Exception as e:
-            print(f"[{self.ip}] !!! Connection error: {e}")
-            self.stop()
 
-    def _listen(self):
-        try:
-            while self.running and self.sock:
-                data = self.sock.recv(4096)
-                if not data:
-                    break
-                    
-                msg = data.decode('utf-8', errors='ignore')
-                if self.debug:
-                    self.log_debug(f"RX Data: {msg.strip()}")
-                
-                if "CSeq: 8" in msg:
-                    print(f"[{self.ip}] >>> Camera accepted. Ready to stream.")
-                    self.is_connected = True
-                    self.sock.settimeout(None) # Disable timeout for streaming
         except Exception as e:
-            if self.running:
-                print(f"[{self.ip}] Listener error: {e}")
-            self.is_connected = False
-
-    def enqueue(self, chunk):
-        # Buffer data even if not yet connected
-        self.audio_queue.append(chunk)
-
-        # Prevent memory leak
-        if not self.is_connected and len(self.audio_queue) > MAX_QUEUE_SIZE_UNCONNECTED:
-            self.audio_queue.popleft()
-            self.log_debug("Queue full (not connected). Dropped oldest packet.")
-            
-        # Logging queue size mostly adds noise, so omitted unless strictly debugging queue
-        # self.log_debug(f"Enqueued. Size: {len(self.audio_queue)}")
-
-    def _process_queue_loop(self):
+            print(f"[{self.ip}] !!! Connection error: {str(e) or 'timed out'}")
+            await self.stop()
+
+    def _on_data(self, data):
+        # Called by the event loop whenever the socket is readable, no listener task needed
+        msg = data.decode('utf-8', errors='ignore')
+        if self.debug:
+            self.log_debug("RX Data: %s", msg.strip())
+
+        if "CSeq: 8" in msg and not self.is_connected:
+            print(f"[{self.ip}] >>> Camera accepted. Ready to stream.")
+            if self._handshake_timer:
+                self._handshake_timer.cancel()
+                self._handshake_timer = None
+            # Skip what the ring overwrote while unconnected, from here on the producer waits for us
+            self.cursor = max(self.cursor, self.ring.tail - self.ring.cap)
+            self.is_connected = True
+            self._wake.set()
+
+    def _on_handshake_timeout(self):
+        self._handshake_timer = None
+        print(f"[{self.ip}] Listener error: timed out")
+        self.transport.close()
+
+    def _on_connection_lost(self, exc):
+        if self.running and exc:
+            print(f"[{self.ip}] Listener error: {exc}")
+        if self._handshake_timer:
+            self._handshake_timer.cancel()
+            self._handshake_timer = None
+        self.is_connected = False
+        self._fd = None
+        self.ring.reader_moved()
+
+    def pending(self):
+        return self.ring.available(self.cursor)
+
+    def _read(self, n):
+        # Returns (spans of ready-to-send frames, number of frames)
+        spans, start, self.cursor = self.ring.read(self.cursor, n)
+        return spans, self.cursor - start
+
+    async def _process_queue_loop(self):
+        bytes_per_second = self.sample_rate * 2
+        burst_packets = bytes_per_second // CHUNK_SIZE
+        monotonic_ns = time.monotonic_ns
+
+        # Throttle in whole chunks so the hot path is one multiply and one compare
+        ns_per_chunk = CHUNK_SIZE * 1_000_000_000 // bytes_per_second
+        if SPEED_MULTIPLIER != 1.0:
+            ns_per_chunk = int(ns_per_chunk / SPEED_MULTIPLIER)
+        schedule_origin_ns = 0 # When chunk 0 is due, MAX_BUFFER_AHEAD_MS before the burst ended
+
         while self.running:
-            if not self.is_connected or not self.sock:
-                time.sleep(0.1)
+            self._wake.clear()
+
+            if not self.is_connected or not self.transport:
+                await self._wake.wait()
                 continue
-                
-            if not self.audio_queue:
-                time.sleep(0.01)
+
+            if not self.pending():
+                await self.ring.wait_until(self.cursor + 1, self._wake)
                 continue
 
             # BURST LOGIC
-            if self.start_time == 0:
-                burst_packets = int((self.sample_rate * 2) / CHUNK_SIZE)
-                if len(self.audio_queue) > burst_packets:
+            if self.start_time_ns == 0:
+                if self.pending() > burst_packets:
                     print(f"[{self.ip}] >>> Bursting {burst_packets} packets...")
-                    for _ in range(burst_packets):
-                        if self.audio_queue:
-                            self._send_rtsp_frame(self.audio_queue.popleft())
-                    self.start_time = time.time() * 1000 # MS
+                    remaining = burst_packets
+                    while remaining > 0 and self.pending():
+                        spans, count = self._read(min(remaining, MAX_BATCH_FRAMES))
+                        await self._send_rtsp_frames(spans, count)
+                        remaining -= count
+                    self.start_time_ns = monotonic_ns()
+                    schedule_origin_ns = self.start_time_ns - MAX_BUFFER_AHEAD_MS * 1_000_000
                 else:
-                    self.log_debug(f"Buffering... Current: {len(self.audio_queue)}, Need: {burst_packets}")
-                    time.sleep(0.1)
+                    if self.debug:
+                        self.log_debug("Buffering... Current: %d, Need: %d", self.pending(), burst_packets)
+                    await self.ring.wait_until(self.cursor + burst_packets + 1, self._wake)
                     continue
 
             # THROTTLING LOGIC
-            time_elapsed = (time.time() * 1000) - self.start_time
-            bytes_per_second = self.sample_rate * 2
-            # Calculate how much audio duration we have sent
-            audio_time_sent_adj = ((self.total_bytes_sent / bytes_per_second) * 1000) / SPEED_MULTIPLIER
-            
-            if audio_time_sent_adj > time_elapsed + MAX_BUFFER_AHEAD_MS:
-                # Buffer full, wait a bit
-                time.sleep(0.01)
+            # Integer nanoseconds on the monotonic clock: immune to NTP steps, no float drift.
+            # The next chunk is due once sending it keeps us within MAX_BUFFER_AHEAD_MS of real time
+            now_ns = monotonic_ns()
+            due_ns = schedule_origin_ns + self.chunks_sent * ns_per_chunk
+
+            if now_ns < due_ns:
+                # Buffer full, sleep until the first tick at which the next frame is due
+                wake_ns = due_ns + (-due_ns % SEND_TICK_NS)
+                await asyncio.sleep((wake_ns - now_ns) / 1_000_000_000)
                 continue
-                
-            if self.audio_queue:
-                self._send_rtsp_frame(self.audio_queue.popleft())
-            
-            # Tiny sleep to yield CPU if needed, but not strictly required
-            # time.sleep(0) 
-
-    def _send_rtsp_frame(self, chunk):
-        if not self.sock: return
-        
-        # $ + Channel(2) + Length(Little Endian)
-        header = struct.pack('<BBH', 0x24, 0x02, FRAME_LEN)
-        padding = b'\x00' * 12
-        
+
+            # Send every frame that is already due in one write
+            n = min(self.pending(), (now_ns - due_ns) // ns_per_chunk + 1, MAX_BATCH_FRAMES)
+            if n > 0:
+                await self._send_rtsp_frames(*self._read(n))
+
+    async def _send_rtsp_frames(self, spans, count):
+        if not self.transport or not count: return
+
         try:
-            self.sock.sendall(header + padding + chunk)
-            self.total_bytes_sent += len(chunk)
+            # Frames are already framed in the ring, so the spans go out as they are.
+            # Wait out real TCP backpressure once the transport buffer passes its high-water mark
+            self._write_frames(spans, count * FRAME_SIZE)
+            # Only now are the slots free, the producer may overwrite them
+            self.ring.reader_moved()
+            if not self.protocol.can_write.is_set():
+                await self._wait_writable()
+            self.chunks_sent += count
         except Exception as e:
             print(f"[{self.ip}] Write error: {e}")
 
-    def stop(self):
+    async def _wait_writable(self):
+        # Short backpressure (e.g. during the burst) holds the producer as usual. A camera
+        # that stops reading would hold back every other one, so after STALL_TIMEOUT the
+        # ring stops waiting for it and it skips what was overwritten once it drains
+        try:
+            await asyncio.wait_for(self.protocol.can_write.wait(), STALL_TIMEOUT)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        self.log_debug("Stalled for %.1fs, no longer holding back the queue", STALL_TIMEOUT)
+        self.stalled = True
+        self.ring.reader_moved()
+        try:
+            await self.protocol.can_write.wait()
+        finally:
+            self.cursor = max(self.cursor, self.ring.tail - self.ring.cap)
+            self.stalled = False
+
+    def _write_frames(self, iov, total):
+        # With nothing queued in the transport, write straight to the socket in one
+        # vectored syscall; writelines() would first join every buffer into a new bytes.
+        # iov are views of the ring, which the producer may overwrite once this returns,
+        # so anything the transport keeps must be a copy
+        if HAS_WRITEV and self._fd is not None and not self.transport.get_write_buffer_size():
+            try:
+                sent = os.writev(self._fd, iov)
+            except OSError:
+                sent = 0 # Socket full or failing, let the transport queue it or report the error
+            if sent == total:
+                return
+
+            # Short write: hand the unsent tail to the transport, keeping byte order
+            i = 0
+            while sent >= len(iov[i]):
+                sent -= len(iov[i])
+                i += 1
+            self.transport.write(b''.join([iov[i][sent:]] + iov[i + 1:]))
+            return
+
+        self.transport.write(b''.join(iov))
+
+    async def stop(self):
         if not self.running: return
         self.running = False
         print(f"[{self.ip}] >>> Disconnecting...")
-        
-        if self.sock:
+
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+
+        if self.transport:
             try:
-                close_cmd = (
-                    f"USER_CMD_SET rtsp://{self.ip}/onvif1 RTSP/1.0\r\n"
-                    "CSeq: 10\r\n"
-                    "Content-length: strlen(Content-type)\r\n"
-                    "Content-type: AudioCtlCmd:CLOSE\r\n\r\n"
-                )
-                self.sock.sendall(close_cmd.encode())
+                self.transport.write(self._close_cmd_bytes)
             except:
                 pass
-            
-            time.sleep(0.05)
-            self.sock.close()
-            self.sock = None
+
+            await asyncio.sleep(0.05)
+            self.transport.close()
+            self.transport = None
+            self._fd = None
         self.is_connected = False
 
-def start_centralized_streaming(file_path, rate, volume, clients):
+class FFmpegProtocol(asyncio.SubprocessProtocol):
+    """Publishes FFmpeg's stdout to the ring straight from each pipe read.
+
+    While the ring is full, reading from the pipe is paused, so FFmpeg blocks
+    on its full pipe until the slowest connected camera frees some room.
+    """
+
+    def __init__(self, ring):
+        self.transport = None
+        self.ring = ring
+        self.backlog = b'' # Stdout bytes from offset on are not in the ring yet
+        self.offset = 0
+        self.paused = False
+        self.eof = False
+        self.stderr = bytearray()
+        self.finished = asyncio.Event()
+        self.exited = asyncio.Event()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def pipe_data_received(self, fd, data):
+        if fd != 1:
+            self.stderr += data
+            return
+        if self.offset < len(self.backlog):
+            data = self.backlog[self.offset:] + data
+        self.backlog = data
+        self.offset = 0
+        self._flush()
+
+    def pipe_connection_lost(self, fd, exc):
+        if fd != 1:
+            return
+
+        # Pad last chunk if needed
+        rest = len(self.backlog) - self.offset
+        if rest % CHUNK_SIZE:
+            # ljust() pads in a single allocation, no temporary padding bytes
+            self.backlog = self.backlog[self.offset:].ljust(rest + (-rest % CHUNK_SIZE), b'\x00')
+            self.offset = 0
+        self.eof = True
+        self._flush()
+
+    def _flush(self):
+        # All whole chunks that fit go into the ring in one publish;
+        # every client reads them behind its own cursor
+        data = self.backlog
+        whole = len(data) - (len(data) - self.offset) % CHUNK_SIZE
+        if whole > self.offset:
+            self.offset += self.ring.publish(memoryview(data)[self.offset:whole]) * CHUNK_SIZE
+
+        if self.offset < whole:
+            # Ring full: stop reading until the ring calls back with room
+            self.ring.on_space = self._flush
+            self._pause_reading(True)
+        elif self.eof:
+            self.backlog = b''
+            self.offset = 0
+            self.finished.set()
+        else:
+            self._pause_reading(False)
+
+    def _pause_reading(self, pause):
+        if pause == self.paused:
+            return
+        self.paused = pause
+        pipe = self.transport.get_pipe_transport(1)
+        if pipe is not None:
+            if pause:
+                pipe.pause_reading()
+            else:
+                pipe.resume_reading()
+
+    def process_exited(self):
+        self.exited.set()
+
+async def start_centralized_streaming(file_path, rate, volume, ring, clients):
     print(f">>> Starting FFmpeg transcoding for {len(clients)} clients...")
-    
+
     cmd = [
         'ffmpeg',
         '-v', 'error', # Suppress logs
@@ -188,29 +500,35 @@ def start_centralized_streaming(file_path, rate, volume, clients):
         '-filter:a', f'volume={volume}',
         'pipe:1'
     ]
-    
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    
-    # Check for immediate errors
-    if process.poll() is not None:
-         _, stderr = process.communicate()
-         print(f"FFmpeg Error: {stderr.decode()}")
-         return
-
-    while True:
-        chunk = process.stdout.read(CHUNK_SIZE)
-        if not chunk:
-            break
-            
-        # Pad last chunk if needed
-        if len(chunk) < CHUNK_SIZE:
-             chunk += b'\x00' * (CHUNK_SIZE - len(chunk))
-             
-        for client in clients:
-            client.enqueue(chunk)
-            
-    print(">>> Finished reading audio file.")
-    process.wait()
+
+    # A protocol instead of a StreamReader: each pipe read is sliced in place,
+    # skipping the reader's bytearray buffer and the copy out of it
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.subprocess_exec(
+        lambda: FFmpegProtocol(ring), *cmd,
+        stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # A larger pipe lets FFmpeg keep decoding while the loop is busy sending frames
+    stdout_transport = transport.get_pipe_transport(1)
+    if stdout_transport and fcntl is not None and hasattr(fcntl, 'F_SETPIPE_SZ'):
+        try:
+            pipe = stdout_transport.get_extra_info('pipe')
+            fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, FFMPEG_PIPE_SIZE)
+        except OSError:
+            pass # Over the system limit, keep the default size
+
+    try:
+        # Check for immediate errors
+        if transport.get_returncode() is not None:
+             await protocol.finished.wait()
+             print(f"FFmpeg Error: {protocol.stderr.decode()}")
+             return
+
+        await protocol.finished.wait()
+        print(">>> Finished reading audio file.")
+        await protocol.exited.wait()
+    finally:
+        transport.close()
 
 def parse_args():
     parser = argparse.ArgumentParser(description="YOOSEE CAMERA INTERCOM CLIENT (Python)")
@@ -221,17 +539,51 @@ def parse_args():
     parser.add_argument('--vol', type=float, default=0.5, help="Volume (0.0-2.0)")
     parser.add_argument('--debug', action='store_true', help="Enable debug logs")
     parser.add_argument('--auto-exit', action='store_true', help="Automatically exit when playback finishes")
-    
+
     return parser.parse_args()
 
+async def run(args, ips):
+    # All cameras share one event loop in the main thread
+    ring = SharedRing(MAX_QUEUE_SIZE)
+    clients = []
+    for ip in ips:
+        client = CameraClient(ip, args.port, args.rate, ring, args.debug)
+        clients.append(client)
+
+    try:
+        await start_centralized_streaming(args.file, args.rate, args.vol, ring, clients)
+
+        # Keep running until user interrupt if clients are still streaming buffer
+        # But usually we exit when file is done since this is a CLI tool.
+        # However, Node version relies on processQueue emptying itself (or not? Node version doesn't exit automatically when buffer empty unless we added that logic).
+        # Node version waits for SIGINT or just keeps running.
+        # Here we just keep main thread alive or wait for Ctrl+C
+        while any(c.pending() > 0 for c in clients):
+            await asyncio.sleep(0.5)
+
+        print(">>> Buffer empty. Waiting for manual stop (Ctrl+C)...")
+        if args.auto_exit:
+            print(">>> Auto-exit enabled. Exiting in 2 seconds...")
+            await asyncio.sleep(2)
+            return
+
+        while True:
+            await asyncio.sleep(1)
+
+    except asyncio.CancelledError:
+        # Ctrl+C: asyncio.run() cancels this task before raising KeyboardInterrupt
+        print("\n>>> Stopping all streams...")
+        raise
+    finally:
+        await asyncio.gather(*(client.stop() for client in clients))
+
 def main():
     args = parse_args()
-    
+
     # Process multiple IPs
     ips_raw = args.ip.split(',')
-    ips = [ip.strip() for ip in ips_raw if ip.strip()]
-    ips = list(set(ips)) # Dedup
-    
+    ips = list(dict.fromkeys(ip.strip() for ip in ips_raw if ip.strip())) # Dedup, keeping order
+
     print('------------------------------------------')
     print(f"Target IPs:  {', '.join(ips)}")
     print(f"Port:        {args.port}")
@@ -241,39 +593,12 @@ def main():
     print(f"Debug Mode:  {'ON' if args.debug else 'OFF'}")
     print(f"Auto Exit:   {'ON' if args.auto_exit else 'OFF'}")
     print('------------------------------------------')
-    
-    clients = []
-    for ip in ips:
-        client = CameraClient(ip, args.port, args.rate, args.debug)
-        clients.append(client)
-        
-    try:
-        start_centralized_streaming(args.file, args.rate, args.vol, clients)
-        
-        # Keep running until user interrupt if clients are still streaming buffer
-        # But usually we exit when file is done since this is a CLI tool. 
-        # However, Node version relies on processQueue emptying itself (or not? Node version doesn't exit automatically when buffer empty unless we added that logic).
-        # Node version waits for SIGINT or just keeps running. 
-        # Here we just keep main thread alive or wait for Ctrl+C
-        while any(len(c.audio_queue) > 0 for c in clients):
-            time.sleep(0.5)
-            
-        print(">>> Buffer empty. Waiting for manual stop (Ctrl+C)...")
-        if args.auto_exit:
-            print(">>> Auto-exit enabled. Exiting in 2 seconds...")
-            time.sleep(2)
-            for client in clients:
-                client.stop()
-            sys.exit(0)
 
-        while True:
-            time.sleep(1)
-            
+    try:
+        asyncio.run(run(args, ips))
     except KeyboardInterrupt:
-        print("\n>>> Stopping all streams...")
-        for client in clients:
-            client.stop()
-        sys.exit(0)
+        pass
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()